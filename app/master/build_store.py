@@ -32,8 +32,7 @@ class BuildStore:
         :param end: 1 + the index of the last requested element, although if this is greater than the total number
                     of builds available the length of the returned list may be smaller than (end - start)
         """
-        requested_builds = islice(cls._all_builds_by_id, start, end)
-        return [cls._all_builds_by_id[key] for key in requested_builds]
+        return list(islice(cls._all_builds_by_id.values(), start, end))
 
     @classmethod
     def add(cls, build: Build):
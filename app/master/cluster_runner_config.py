@@ -3,6 +3,12 @@ import yaml
 from app.master.job_config import JobConfig
 from app.util import log
 
+# Use the libyaml-backed loader when PyYAML was built against libyaml; it parses much faster than the pure-Python one.
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 class ClusterRunnerConfig(object):
     """
@@ -60,7 +66,7 @@ class ClusterRunnerConfig(object):
         :param config: The parsed yaml data
         :type config: dict
         """
-        config = yaml.safe_load(self._raw_yaml_contents)
+        config = yaml.load(self._raw_yaml_contents, Loader=SafeLoader)
 
         if not isinstance(config, dict):
             raise ConfigParseError('The yaml config file could not be parsed to a dictionary')
@@ -125,21 +125,17 @@ class JobConfig(object):
         if not isinstance(commands, list):
             return None
 
-        # We should join the commands with double ampersands UNLESS the command already ends with a single ampersand.
-        # A semicolon (or a double ampersand) is invalid syntax after a single ampersand.
-        sanitized_commands = []
-        for command in commands:
-            if command is None:
-                # skip `None` command in the commands list
-                continue
-            stripped_command = command.strip().rstrip(';')
-            # If the command ends with an ampersand (single or double) we can leave the command alone (empty postfix)
-            postfix = ' ' if stripped_command.strip().endswith('&') else ' && '
-            sanitized_commands.append(stripped_command + postfix)
+        # Skip `None` commands (e.g., empty or comment-only YAML list items) and strip any trailing semicolons.
+        stripped_commands = (command.strip().rstrip(';') for command in commands if command is not None)
 
+        # We should join the commands with double ampersands UNLESS the command already ends with a single ampersand.
+        # A semicolon (or a double ampersand) is invalid syntax after a single ampersand. If the command ends with an
+        # ampersand (single or double) we can leave the command alone (empty postfix).
         # '&&' must not be appended to the command for the last shell command. For the sake of homogeneity of the
-        # loop above, we just strip out the '&&' here.
-        joined_commands = ''.join(sanitized_commands).strip()
+        # join below, we just strip out the '&&' afterwards.
+        joined_commands = ''.join(
+            command + (' ' if command.strip().endswith('&') else ' && ') for command in stripped_commands
+        ).strip()
 
         if joined_commands.endswith('&&'):
             joined_commands = joined_commands.rstrip('&').strip()
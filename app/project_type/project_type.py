@@ -1,4 +1,5 @@
 from collections import OrderedDict, namedtuple
+import functools
 import inspect
 import os
 import re
@@ -396,17 +397,29 @@ class ProjectType(object):
         }
         :rtype: dict[str, _ProjectTypeArgumentInfo]
         """
+        blacklist = blacklist or []
+        # Copy the cached mapping so that callers can't modify it.
+        return OrderedDict((argument_name, argument_info)
+                           for argument_name, argument_info in cls._all_constructor_arguments_info().items()
+                           if argument_name not in blacklist)
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _all_constructor_arguments_info(cls):
+        """
+        Introspect the constructor's signature and docstring for constructor_arguments_info(). The result only depends
+        on the class, so it is computed once per class.
+
+        :rtype: OrderedDict[str, _ProjectTypeArgumentInfo]
+        """
         constructor_doc = inspect.getdoc(cls.__init__) or ''
         arg_spec = inspect.getfullargspec(cls.__init__)
-        blacklist = blacklist or []
         argument_names = arg_spec.args[1:]  # discard "self", which is the first argument.
         default_arg_values = arg_spec.defaults or []
         num_required_args = len(argument_names) - len(default_arg_values)
 
         arguments_info = OrderedDict()
         for argument_index, argument_name in enumerate(argument_names):
-            if argument_name in blacklist:
-                continue
             # extract the doc for this param from the docstring. note: this only grabs the first line, so we can add
             # "private" additional doc on following lines.
             docstring_match = re.search(r'^\s*:param ' + argument_name + ': (.*)$', constructor_doc, re.MULTILINE)
@@ -83,11 +83,8 @@ class ClusterBaseHandler(tornado.web.RequestHandler):
         offset = offset if offset is not None else Configuration['pagination_offset']
         limit = limit if limit is not None else Configuration['pagination_limit']
 
-        # A negative limit will give no results
-        limit = max(limit, 0)
-        offset = max(offset, 0)
-
-        return offset, min(limit, Configuration['pagination_max_limit'])
+        # Clamp both values in a single pass. A negative limit will give no results.
+        return max(offset, 0), min(max(limit, 0), Configuration['pagination_max_limit'])
 
     def on_finish(self):
         if self._route_node is not None:
@@ -3,7 +3,7 @@ import functools
 import logbook
 import os
 from unittest import TestCase
-from unittest.mock import MagicMock, NonCallableMock, patch
+from unittest.mock import DEFAULT, MagicMock, NonCallableMock, patch
 
 from app.master.build import Build
 from app.master.slave import Slave, SlaveRegistry
@@ -14,10 +14,39 @@ from app.util.counter import Counter
 from app.util.unhandled_exception_handler import UnhandledExceptionHandler
 
 
-class BaseUnitTestCase(TestCase):
+class _ClassPatchCleanupMeta(type):
+    """
+    Metaclass that stops the patches started by patch_class() if a test class's setUpClass() raises. unittest does not
+    call tearDownClass() in that case (and Python 3.4 has no addClassCleanup()), so the patches would otherwise stay
+    active for the rest of the test run.
+    """
+    def __new__(mcs, name, bases, namespace):
+        set_up_class = namespace.get('setUpClass')
+        if isinstance(set_up_class, classmethod):
+            namespace['setUpClass'] = classmethod(_stop_class_patches_on_error(set_up_class.__func__))
+        return super().__new__(mcs, name, bases, namespace)
+
+
+def _stop_class_patches_on_error(set_up_class_func):
+    """
+    :type set_up_class_func: callable
+    :rtype: callable
+    """
+    @functools.wraps(set_up_class_func)
+    def set_up_class_wrapper(cls):
+        try:
+            set_up_class_func(cls)
+        except BaseException:
+            cls._stop_class_patches()
+            raise
+    return set_up_class_wrapper
+
+
+class BaseUnitTestCase(TestCase, metaclass=_ClassPatchCleanupMeta):
 
     _base_setup_called = False
     _base_teardown_called = False
+    _class_patches = ()  # Overridden per class by patch_class(); a list of (mock, patcher) pairs in the order started.
     # This allows test classes (e.g., TestNetwork) to disable network-related patches for testing the patched code.
     _do_network_mocks = True
     _fake_hostname = 'fake_hostname'
@@ -26,10 +55,35 @@ class BaseUnitTestCase(TestCase):
         super().__init__(*args, **kwargs)
         self.addCleanup(self._assert_base_setup_and_teardown_were_called)
 
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._stop_class_patches()
+
+    @classmethod
+    def _stop_class_patches(cls):
+        """
+        Stop the patches started by patch_class() for this class in the reverse order that they were started.
+        """
+        class_patches = cls.__dict__.get('_class_patches', [])
+        while class_patches:
+            _, patcher = class_patches.pop()
+            patcher.__exit__(None, None, None)
+
     def setUp(self):
         super().setUp()
         self.addCleanup(patch.stopall)
 
+        # Class-level patches are shared by every test in the class, so clear any calls recorded by a previous test and
+        # any behavior it configured. Replacing the return value also gives each test a fresh child mock (e.g., a new
+        # instance mock for a patched class). Targets patched with a 'new' object that isn't a mock have nothing to
+        # reset.
+        for class_mock, _ in self._class_patches:
+            if hasattr(class_mock, 'reset_mock'):
+                class_mock.reset_mock()
+                class_mock.return_value = DEFAULT
+                class_mock.side_effect = None
+
         self._patched_items = {}
         self._blacklist_methods_not_allowed_in_unit_tests()
 
@@ -122,8 +176,9 @@ class BaseUnitTestCase(TestCase):
 
         # Check to see if this target has already been patched. Usually if `target` has already been patched, the
         # patcher.start() method will raise a TypeError anyway, but there are certain cases where this doesn't happen
-        # reliably (e.g., 'os.unlink') so this check is an attempt to make that detection reliable.
-        elif isinstance(item_to_patch, NonCallableMock):
+        # reliably (e.g., 'os.unlink') so this check is an attempt to make that detection reliable. Autospecced
+        # functions are not NonCallableMocks, so also check the targets patched for the whole class.
+        elif isinstance(item_to_patch, NonCallableMock) or self._is_class_patched(item_to_patch):
             raise UnitTestPatchError('Target "{}" is already a mock. Has this target already been patched either in '
                                      'this class ({}) or in BaseUnitTestCase?'.format(target, self.__class__.__name__))
         try:
@@ -135,6 +190,48 @@ class BaseUnitTestCase(TestCase):
         self._patched_items[mock] = patcher, allow_repatch
         return mock
 
+    @classmethod
+    def patch_class(cls, target, **kwargs):
+        """
+        Replaces the specified target with a mock for every test in the class. This should be called from setUpClass()
+        for patches that are the same for each test; it saves starting and stopping the same patch around every test.
+        Like patch(), this defaults the 'autospec' parameter to True. The patch is restored in tearDownClass().
+
+        The returned mock is shared by all tests in the class. Before each test, its recorded calls are cleared and its
+        return_value and side_effect are reset, so tests should configure it in setUp() rather than in setUpClass().
+
+        If setUpClass() raises after calling this, the patches it started are stopped before the exception propagates.
+
+        :param target: The item (object, method, etc.) to replace with a mock. (See docs for unittest.mock.patch.)
+        :type target: str
+        :param kwargs: Additional arguments to be passed to unittest.mock.patch
+        :type kwargs: dict
+        :return: The mock object that target has been replaced with
+        :rtype: MagicMock
+        """
+        if 'new' not in kwargs:
+            kwargs.setdefault('autospec', True)
+
+        if '_class_patches' not in cls.__dict__:
+            cls._class_patches = []
+
+        # Enter the patcher directly instead of calling patcher.start(). Started patchers are registered with
+        # patch.stopall(), which runs after each test and would undo this patch after the first test in the class.
+        patcher = patch(target, **kwargs)
+        mock = patcher.__enter__()
+        cls._class_patches.append((mock, patcher))
+        return mock
+
+    def _is_class_patched(self, item):
+        """
+        Whether the specified item is a mock (or 'new' object) that patch_class() put in place for this class. This
+        compares by identity since the 'new' object passed to patch_class() may not be hashable.
+
+        :type item: object
+        :rtype: bool
+        """
+        return any(item is class_mock for class_mock, _ in self._class_patches)
+
     def patch_object(self, target, attribute, **kwargs):
         """
         Replace the named attribute on the given object with a mock.
@@ -1,3 +1,4 @@
+from collections import namedtuple, OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from threading import Event
@@ -6,7 +7,7 @@ from typing import Optional
 from genty import genty, genty_dataset
 from hypothesis import given
 from hypothesis.strategies import text, dictionaries, integers
-from unittest.mock import MagicMock, Mock
+from unittest.mock import Mock
 
 from app.master.atom import Atom
 from app.master.build import Build
@@ -21,18 +22,76 @@ from app.util.exceptions import BadRequestError, ItemNotFoundError
 from test.framework.base_unit_test_case import BaseUnitTestCase
 
 
+_PAGINATION_OFFSET = 0
+_PAGINATION_LIMIT = 5
+_PAGINATION_MAX_LIMIT = 10
+_NUM_ITEMS = 20
+
+# Attribute names used to spec mocks. Passing a precomputed name list instead of the class skips the per-mock class
+# introspection that Mock does for a class spec, which adds up in the pagination tests that create many mocks.
+_BUILD_SPEC = dir(Build)
+_SUBJOB_SPEC = dir(Subjob)
+_ATOM_SPEC = dir(Atom)
+
+# Stub builds with ids 1 to 20 for the build pagination test. The test only reads build_id, so a namedtuple stands in
+# for a spec'd Mock. They are only read from, so they are created once and copied into the build store in bulk.
+_FakeBuild = namedtuple('_FakeBuild', ['build_id'])
+_PAGINATION_BUILDS_BY_ID = OrderedDict((build_id, _FakeBuild(build_id)) for build_id in range(1, _NUM_ITEMS + 1))
+
+# Shared by the build, subjob and atom pagination tests below. Each row is:
+# (offset, limit, expected_first_id, expected_last_id)
+_PAGINATION_DATASET = {
+    # No params simulates a v1 request
+    'no_params': (
+        None, None,
+        1,
+        0 + _NUM_ITEMS
+    ),
+    # Params simulate a v2 request
+    'offset_param': (
+        3, _PAGINATION_LIMIT,
+        3 + 1,
+        3 + _PAGINATION_LIMIT
+    ),
+    'limit_param': (
+        _PAGINATION_OFFSET, 5,
+        _PAGINATION_OFFSET + 1,
+        _PAGINATION_OFFSET + 5
+    ),
+    'offset_and_limit_params': (
+        3, 5,
+        3 + 1,
+        3 + 5
+    ),
+    'low_limit': (
+        _PAGINATION_OFFSET, 2,
+        _PAGINATION_OFFSET + 1,
+        _PAGINATION_OFFSET + 2
+    ),
+    'max_limit': (
+        _PAGINATION_OFFSET, _PAGINATION_MAX_LIMIT,
+        _PAGINATION_OFFSET + 1,
+        _PAGINATION_OFFSET + _PAGINATION_MAX_LIMIT
+    ),
+    'too_high_offset': (
+        1000, _PAGINATION_LIMIT,
+        None,
+        None
+    ),
+}
+
+
 @genty
 class TestClusterMaster(BaseUnitTestCase):
-    _PAGINATION_OFFSET = 0
-    _PAGINATION_LIMIT = 5
-    _PAGINATION_MAX_LIMIT = 10
-    _NUM_BUILDS = _NUM_SUBJOBS = _NUM_ATOMS = 20
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.patch_class('app.util.fs.create_dir')
+        cls.patch_class('app.util.fs.async_delete')
 
     def setUp(self):
         super().setUp()
-        self.patch('app.util.fs.create_dir')
-        self.patch('app.util.fs.async_delete')
-        self.patch('os.makedirs')
         self.mock_slave_allocator = self.patch('app.master.cluster_master.SlaveAllocator').return_value
         self.mock_scheduler_pool = self.patch('app.master.cluster_master.BuildSchedulerPool').return_value
 
@@ -48,14 +107,41 @@ class TestClusterMaster(BaseUnitTestCase):
         self._thread_pool_executor_cls.return_value.submit.side_effect = \
             self.thread_pool_executor.submit
 
-        Configuration['pagination_offset'] = self._PAGINATION_OFFSET
-        Configuration['pagination_limit'] = self._PAGINATION_LIMIT
-        Configuration['pagination_max_limit'] = self._PAGINATION_MAX_LIMIT
+        Configuration['pagination_offset'] = _PAGINATION_OFFSET
+        Configuration['pagination_limit'] = _PAGINATION_LIMIT
+        Configuration['pagination_max_limit'] = _PAGINATION_MAX_LIMIT
 
     def tearDown(self):
         super().tearDown()
         self.thread_pool_executor.shutdown()
 
+    def _register_slave(self, slave_url, num_executors=10):
+        """
+        Add a slave directly to the slave registry. This skips the master-side onboarding done by connect_slave() for
+        tests that only need a registered slave to act on.
+
+        :type slave_url: str
+        :type num_executors: int
+        :rtype: Slave
+        """
+        slave = Slave(slave_url, num_executors)
+        SlaveRegistry.singleton().add_slave(slave)
+        return slave
+
+    def _register_build_and_slave(self, build_id, build, slave_url):
+        """
+        Store the build and a mock slave so the master can find both when a slave reports a subjob result.
+
+        :type build_id: int
+        :type build: Build
+        :type slave_url: str
+        :return: The mock scheduler that the master will use for the build
+        :rtype: Mock
+        """
+        BuildStore._all_builds_by_id[build_id] = build
+        SlaveRegistry.singleton()._all_slaves_by_url[slave_url] = Mock()
+        return self.mock_scheduler_pool.get.return_value
+
     def test_connect_slave_adds_new_slave_if_slave_never_connected_before(self):
         master = ClusterMaster()
         slave_registry = SlaveRegistry.singleton()
@@ -75,7 +161,7 @@ class TestClusterMaster(BaseUnitTestCase):
         old_existing_slave = slave_registry.get_slave(slave_id=None, slave_url='existing-slave.turtles.gov')
         old_existing_slave_id = old_existing_slave.id
 
-        connect_response = master.connect_slave('existing-slave.turtles.gov', 10)
+        master.connect_slave('existing-slave.turtles.gov', 10)
 
         with self.assertRaises(ItemNotFoundError):
             slave_registry.get_slave(slave_id=old_existing_slave_id)
@@ -96,15 +182,15 @@ class TestClusterMaster(BaseUnitTestCase):
                             'The re-connected slave should have generated a new slave id.')
         self.assertTrue(new_slave.is_alive(use_cached=True),
                         'The new slave should have been marked as alive once instantiated.')
-        self.assertEquals(2, self.mock_slave_allocator.add_idle_slave.call_count,
-                          'Expected slave to be added to the idle slaves list.')
+        self.assertEqual(2, self.mock_slave_allocator.add_idle_slave.call_count,
+                         'Expected slave to be added to the idle slaves list.')
 
     def test_connect_slave_with_existing_slave_running_build_cancels_build(self):
         master = ClusterMaster()
         slave_registry = SlaveRegistry.singleton()
 
         master.connect_slave('running-slave.turtles.gov', 10)
-        build_mock = MagicMock(spec_set=Build)
+        build_mock = Mock(spec_set=_BUILD_SPEC)
         BuildStore._all_builds_by_id[1] = build_mock
         existing_slave = slave_registry.get_slave(slave_id=None, slave_url='running-slave.turtles.gov')
         existing_slave.current_build_id = 1
@@ -141,39 +227,23 @@ class TestClusterMaster(BaseUnitTestCase):
         with self.assertRaises(ItemNotFoundError):
             master.handle_request_to_update_build(invalid_build_id, update_params)
 
-    def test_updating_slave_to_disconnected_state_should_mark_slave_as_dead(self):
+    def test_updating_slave_to_disconnected_state_should_mark_slave_as_dead_and_reset_current_build_id(self):
         master = ClusterMaster()
-        slave_registry = SlaveRegistry.singleton()
-        slave_url = 'raphael.turtles.gov'
-        master.connect_slave(slave_url, num_executors=10)
-        slave = slave_registry.get_slave(slave_url=slave_url)
+        slave = self._register_slave('raphael.turtles.gov')
+        slave.current_build_id = 4
         self.assertTrue(slave.is_alive())
 
         master.handle_slave_state_update(slave, SlaveState.DISCONNECTED)
 
         self.assertFalse(slave.is_alive())
-
-    def test_updating_slave_to_disconnected_state_should_reset_slave_current_build_id(self):
-        master = ClusterMaster()
-        slave_registry = SlaveRegistry.singleton()
-        slave_url = 'raphael.turtles.gov'
-        master.connect_slave(slave_url, num_executors=10)
-        slave = slave_registry.get_slave(slave_url=slave_url)
-        slave.current_build_id = 4
-
-        master.handle_slave_state_update(slave, SlaveState.DISCONNECTED)
-
         self.assertIsNone(slave.current_build_id)
 
     def test_updating_slave_to_setup_completed_state_should_tell_build_to_begin_subjob_execution(self):
         master = ClusterMaster()
-        slave_registry = SlaveRegistry.singleton()
-        fake_build = MagicMock(spec_set=Build)
-        master.get_build = MagicMock(return_value=fake_build)
-        slave_url = 'raphael.turtles.gov'
-        master.connect_slave(slave_url, 10)
-        slave = slave_registry.get_slave(slave_url=slave_url)
-        mock_scheduler = self.mock_scheduler_pool.get(fake_build)
+        fake_build = Mock(spec_set=_BUILD_SPEC)
+        master.get_build = Mock(return_value=fake_build)
+        slave = self._register_slave('raphael.turtles.gov')
+        mock_scheduler = self.mock_scheduler_pool.get.return_value
         scheduler_begin_event = Event()
         mock_scheduler.begin_subjob_executions_on_slave.side_effect = lambda **_: scheduler_begin_event.set()
 
@@ -185,24 +255,22 @@ class TestClusterMaster(BaseUnitTestCase):
         _, call_kwargs = mock_scheduler.begin_subjob_executions_on_slave.call_args
         self.assertEqual(call_kwargs.get('slave'), slave)
 
-    def test_updating_slave_to_shutdown_should_call_slave_set_shutdown_mode(self):
+    @genty_dataset(
+        disconnected=(SlaveState.DISCONNECTED, 'mark_dead'),
+        shutdown=(SlaveState.SHUTDOWN, 'set_shutdown_mode'),
+    )
+    def test_updating_slave_state_should_call_corresponding_slave_method(self, new_slave_state, slave_method_name):
         master = ClusterMaster()
-        slave_registry = SlaveRegistry.singleton()
-        slave_url = 'raphael.turtles.gov'
-        master.connect_slave(slave_url, 10)
-        slave = slave_registry.get_slave(slave_url=slave_url)
-        slave.set_shutdown_mode = Mock()
+        slave = self._register_slave('raphael.turtles.gov')
+        slave_method = self.patch_object(slave, slave_method_name)
 
-        master.handle_slave_state_update(slave, SlaveState.SHUTDOWN)
+        master.handle_slave_state_update(slave, new_slave_state)
 
-        slave.set_shutdown_mode.assert_called_once_with()
+        slave_method.assert_called_once_with()
 
     def test_updating_slave_to_nonexistent_state_should_raise_bad_request_error(self):
         master = ClusterMaster()
-        slave_registry = SlaveRegistry.singleton()
-        slave_url = 'raphael.turtles.gov'
-        master.connect_slave(slave_url, 10)
-        slave = slave_registry.get_slave(slave_url=slave_url)
+        slave = self._register_slave('raphael.turtles.gov')
 
         with self.assertRaises(BadRequestError):
             master.handle_slave_state_update(slave, 'NONEXISTENT_STATE')
@@ -252,14 +320,12 @@ class TestClusterMaster(BaseUnitTestCase):
         build.generate_project_type()
         build.cancel()
 
-        self.patch_object(build, '_handle_subjob_payload')
-        self.patch_object(build, '_mark_subjob_complete')
+        # The build is local to this test, so its methods can be replaced directly without a patcher to undo.
+        build._handle_subjob_payload = Mock()
+        build._mark_subjob_complete = Mock()
 
         master = ClusterMaster()
-        slave_registry = SlaveRegistry.singleton()
-        BuildStore._all_builds_by_id[build_id] = build
-        slave_registry._all_slaves_by_url[slave_url] = Mock()
-        mock_scheduler = self.mock_scheduler_pool.get(build)
+        mock_scheduler = self._register_build_and_slave(build_id, build, slave_url)
 
         master.handle_result_reported_from_slave(slave_url, build_id, 1)
 
@@ -271,14 +337,11 @@ class TestClusterMaster(BaseUnitTestCase):
 
     def test_exception_raised_during_complete_subjob_does_not_prevent_slave_teardown(self):
         slave_url = 'raphael.turtles.gov'
-        mock_build = Mock(spec_set=Build, build_id=lambda: 777, is_finished=False)
+        mock_build = Mock(spec_set=_BUILD_SPEC, build_id=lambda: 777, is_finished=False)
         mock_build.complete_subjob.side_effect = [RuntimeError('Write failed')]
 
         master = ClusterMaster()
-        slave_registry = SlaveRegistry.singleton()
-        BuildStore._all_builds_by_id[mock_build.build_id()] = mock_build
-        slave_registry._all_slaves_by_url[slave_url] = Mock()
-        mock_scheduler = self.mock_scheduler_pool.get(mock_build)
+        mock_scheduler = self._register_build_and_slave(mock_build.build_id(), mock_build, slave_url)
 
         with self.assertRaisesRegex(RuntimeError, 'Write failed'):
             master.handle_result_reported_from_slave(slave_url, mock_build.build_id(), subjob_id=888)
@@ -296,45 +359,7 @@ class TestClusterMaster(BaseUnitTestCase):
         BuildStore._all_builds_by_id = {build_id: Build({})}
         master.handle_request_to_update_build(build_id, update_params)
 
-    @genty_dataset(
-        # No params simulates a v1 request
-        no_params=(
-            None, None,
-            1,
-            0 + _NUM_BUILDS
-        ),
-        # Params simulate a v2 request
-        offset_param=(
-            3, _PAGINATION_LIMIT,
-            3 + 1,
-            3 + _PAGINATION_LIMIT
-        ),
-        limit_param=(
-            _PAGINATION_OFFSET, 5,
-            _PAGINATION_OFFSET + 1,
-            _PAGINATION_OFFSET + 5
-        ),
-        offset_and_limit_params=(
-            3, 5,
-            3 + 1,
-            3 + 5
-        ),
-        low_limit=(
-            _PAGINATION_OFFSET, 2,
-            _PAGINATION_OFFSET + 1,
-            _PAGINATION_OFFSET + 2
-        ),
-        max_limit=(
-            _PAGINATION_OFFSET, _PAGINATION_MAX_LIMIT,
-            _PAGINATION_OFFSET + 1,
-            _PAGINATION_OFFSET + _PAGINATION_MAX_LIMIT
-        ),
-        too_high_offset=(
-            1000, _PAGINATION_LIMIT,
-            None,
-            None
-        ),
-    )
+    @genty_dataset(**_PAGINATION_DATASET)
     def test_builds_with_pagination_request(
             self,
             offset: Optional[int],
@@ -342,13 +367,9 @@ class TestClusterMaster(BaseUnitTestCase):
             expected_first_build_id: int,
             expected_last_build_id: int,
             ):
-        master = ClusterMaster()
-        # Create 20 mock builds with ids 1 to 20
-        for build_id in range(1, self._NUM_BUILDS + 1):
-            build_mock = Mock(spec=Build)
-            build_mock.build_id = build_id
-            BuildStore._all_builds_by_id[build_id] = build_mock
+        self.patch_object(BuildStore, '_all_builds_by_id', new=OrderedDict(_PAGINATION_BUILDS_BY_ID))
 
+        master = ClusterMaster()
         requested_builds = master.get_builds(offset, limit)
 
         id_of_first_build = requested_builds[0].build_id if len(requested_builds) else None
@@ -358,47 +379,9 @@ class TestClusterMaster(BaseUnitTestCase):
         self.assertEqual(id_of_first_build, expected_first_build_id, 'Received the wrong first build from request')
         self.assertEqual(id_of_last_build, expected_last_build_id, 'Received the wrong last build from request')
         if offset is not None and limit is not None:
-            self.assertLessEqual(num_builds, self._PAGINATION_MAX_LIMIT, 'Received too many builds from request')
+            self.assertLessEqual(num_builds, _PAGINATION_MAX_LIMIT, 'Received too many builds from request')
 
-    @genty_dataset(
-        # No params simulates a v1 request
-        no_params=(
-            None, None,
-            1,
-            0 + _NUM_SUBJOBS
-        ),
-        # Params simulate a v2 request
-        offset_param=(
-            3, _PAGINATION_LIMIT,
-            3 + 1,
-            3 + _PAGINATION_LIMIT
-        ),
-        limit_param=(
-            _PAGINATION_OFFSET, 5,
-            _PAGINATION_OFFSET + 1,
-            _PAGINATION_OFFSET + 5
-        ),
-        offset_and_limit_params=(
-            3, 5,
-            3 + 1,
-            3 + 5
-        ),
-        low_limit=(
-            _PAGINATION_OFFSET, 2,
-            _PAGINATION_OFFSET + 1,
-            _PAGINATION_OFFSET + 2
-        ),
-        max_limit=(
-            _PAGINATION_OFFSET, _PAGINATION_MAX_LIMIT,
-            _PAGINATION_OFFSET + 1,
-            _PAGINATION_OFFSET + _PAGINATION_MAX_LIMIT
-        ),
-        too_high_offset=(
-            1000, _PAGINATION_LIMIT,
-            None,
-            None
-        ),
-    )
+    @genty_dataset(**_PAGINATION_DATASET)
     def test_subjobs_with_pagination_request(
             self,
             offset: Optional[int],
@@ -408,8 +391,8 @@ class TestClusterMaster(BaseUnitTestCase):
             ):
         build = Build(BuildRequest({}))
         # Create 20 mock subjobs with ids 1 to 20
-        for subjob_id in range(1, self._NUM_SUBJOBS + 1):
-            subjob_mock = Mock(spec=Subjob)
+        for subjob_id in range(1, _NUM_ITEMS + 1):
+            subjob_mock = Mock(spec=_SUBJOB_SPEC)
             subjob_mock.subjob_id = subjob_id
             build._all_subjobs_by_id[subjob_id] = subjob_mock
 
@@ -422,48 +405,10 @@ class TestClusterMaster(BaseUnitTestCase):
         self.assertEqual(id_of_first_subjob, expected_first_subjob_id, 'Received the wrong first subjob from request')
         self.assertEqual(id_of_last_subjob, expected_last_subjob_id, 'Received the wrong last subjob from request')
         if offset is not None and limit is not None:
-            self.assertLessEqual(num_subjobs, self._PAGINATION_MAX_LIMIT, 'Received too many subjobs from request')
+            self.assertLessEqual(num_subjobs, _PAGINATION_MAX_LIMIT, 'Received too many subjobs from request')
 
 
-    @genty_dataset(
-        # No params simulates a v1 request
-        no_params=(
-            None, None,
-            1,
-            0 + _NUM_ATOMS
-        ),
-        # Params simulate a v2 request
-        offset_param=(
-            3, _PAGINATION_LIMIT,
-            3 + 1,
-            3 + _PAGINATION_LIMIT
-        ),
-        limit_param=(
-            _PAGINATION_OFFSET, 5,
-            _PAGINATION_OFFSET + 1,
-            _PAGINATION_OFFSET + 5
-        ),
-        offset_and_limit_params=(
-            3, 5,
-            3 + 1,
-            3 + 5
-        ),
-        low_limit=(
-            _PAGINATION_OFFSET, 2,
-            _PAGINATION_OFFSET + 1,
-            _PAGINATION_OFFSET + 2
-        ),
-        max_limit=(
-            _PAGINATION_OFFSET, _PAGINATION_MAX_LIMIT,
-            _PAGINATION_OFFSET + 1,
-            _PAGINATION_OFFSET + _PAGINATION_MAX_LIMIT
-        ),
-        too_high_offset=(
-            1000, _PAGINATION_LIMIT,
-            None,
-            None
-        ),
-    )
+    @genty_dataset(**_PAGINATION_DATASET)
     def test_atoms_with_pagination_request(
             self,
             offset: Optional[int],
@@ -473,8 +418,8 @@ class TestClusterMaster(BaseUnitTestCase):
             ):
         # Create 20 mock atoms with ids 1 to 20
         atoms = []
-        for atom_id in range(1, self._NUM_ATOMS + 1):
-            atom_mock = Mock(spec=Atom)
+        for atom_id in range(1, _NUM_ITEMS + 1):
+            atom_mock = Mock(spec=_ATOM_SPEC)
             atom_mock.id = atom_id
             atoms.append(atom_mock)
 
@@ -482,7 +427,6 @@ class TestClusterMaster(BaseUnitTestCase):
         subjob_id = 1
         project_type = None
         job_config = None
-        subjob_atoms = atoms
         subjob = Subjob(build_id, subjob_id, project_type, job_config, atoms)
 
         requested_atoms = subjob.get_atoms(offset, limit)
@@ -494,4 +438,4 @@ class TestClusterMaster(BaseUnitTestCase):
         self.assertEqual(id_of_first_atom, expected_first_atom_id, 'Received the wrong first atom from request')
         self.assertEqual(id_of_last_atom, expected_last_atom_id, 'Received the wrong last atom from request')
         if offset is not None and limit is not None:
-            self.assertLessEqual(num_atoms, self._PAGINATION_MAX_LIMIT, 'Received too many atoms from request')
+            self.assertLessEqual(num_atoms, _PAGINATION_MAX_LIMIT, 'Received too many atoms from request')
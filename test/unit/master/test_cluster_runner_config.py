@@ -98,6 +98,11 @@ class TestClusterRunnerConfig(BaseUnitTestCase):
             - echo "go"
     """
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # The minimal config is only ever read from, so parse it once for all the tests that use it.
+        cls._minimal_job_config = ClusterRunnerConfig(cls._MINIMAL_CONFIG).get_job_config()
 
     @genty_dataset(
         complete_valid_config=(_COMPLETE_VALID_CONFIG, {
@@ -128,9 +133,7 @@ class TestClusterRunnerConfig(BaseUnitTestCase):
         ('setup_build', None),
     )
     def test_undefined_conf_properties_return_default_values(self, conf_method_name, expected_value):
-        config = ClusterRunnerConfig(self._MINIMAL_CONFIG)
-        job_config = config.get_job_config()
-        actual_value = getattr(job_config, conf_method_name)
+        actual_value = getattr(self._minimal_job_config, conf_method_name)
 
         self.assertEqual(actual_value, expected_value,
                          'The default output of {}() should match the expected value.'.format(conf_method_name))
@@ -150,11 +153,8 @@ class TestClusterRunnerConfig(BaseUnitTestCase):
             return
         self.assertTrue(is_expected_valid, 'Config is not valid, but parsed without error')
 
-    @genty_dataset(
-        freeform_atomizer=(_FREEFORM_ATOMIZER,),
-    )
-    def test_incorrect_atomizer_type_raises_exception(self, config_contents):
-        config = ClusterRunnerConfig(config_contents)
+    def test_incorrect_atomizer_type_raises_exception(self):
+        config = ClusterRunnerConfig(self._FREEFORM_ATOMIZER)
         with self.assertRaises(ConfigValidationError):
             config.get_job_config()
 
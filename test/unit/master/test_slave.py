@@ -1,8 +1,8 @@
 from datetime import datetime
 from genty import genty, genty_dataset
-from unittest.mock import Mock, MagicMock, ANY
+from types import SimpleNamespace
+from unittest.mock import ANY, Mock
 
-from app.master.build import Build
 from app.master.build_request import BuildRequest
 from app.master.slave import DeadSlaveError, SlaveMarkedForShutdownError, Slave, SlaveError, SlaveRegistry
 from app.master.subjob import Subjob
@@ -14,19 +14,64 @@ from test.framework.base_unit_test_case import BaseUnitTestCase
 from test.framework.comparators import AnyStringMatching, AnythingOfType
 
 
+# Passed to start_subjob() in tests where the slave rejects the subjob before reading anything off of it.
+_SENTINEL_SUBJOB = object()
+
+# Matches the url that Slave.kill() posts to. Built once since AnyStringMatching compiles its pattern.
+_KILL_URL_MATCHER = AnyStringMatching('/v1/kill')
+
+
+class _FakeDatetime:
+    """
+    Stands in for the datetime class in app.master.slave. Slave only calls datetime.now(), so this returns a fixed time
+    that tests can set directly instead of configuring a mock.
+    """
+    current_datetime = None
+
+    @classmethod
+    def now(cls):
+        return cls.current_datetime
+
+
+class _FakeResponse:
+    """
+    Stands in for the response returned by Network.get() in the is_alive() tests. It records whether the response body
+    was read so tests can check that is_alive() only reads the body of ok responses.
+    """
+    def __init__(self, ok, json_data=None):
+        self.ok = ok
+        self.json_was_read = False
+        self._json_data = json_data
+
+    def json(self):
+        self.json_was_read = True
+        return self._json_data
+
+
+@genty
 class TestSlave(BaseUnitTestCase):
 
     _FAKE_SLAVE_URL = 'splinter.sensei.net:43001'
     _FAKE_NUM_EXECUTORS = 10
+    _FAKE_SLAVE_API_URL = 'http://{}/v1'.format(_FAKE_SLAVE_URL)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Stand-ins for subjob constructor args that tests don't care about. Subjob only sets the subjob id and state
+        # on its atoms (which it does again each time one is constructed), so these are safe to share between tests.
+        cls._default_project_type = Mock()
+        cls._default_job_config = Mock()
+        cls._default_atom = Mock()
+        cls._mock_network_cls = cls.patch_class('app.master.slave.Network')
+        cls.patch_class('app.master.slave.datetime', new=_FakeDatetime)
 
     def setUp(self):
         super().setUp()
-        self.mock_network = self.patch('app.master.slave.Network').return_value
+        self.mock_network = self._mock_network_cls.return_value
 
-        # mock datetime
         self._mock_current_datetime = datetime(2018,4,1)
-        self._mock_datetime = self.patch('app.master.slave.datetime')
-        self._mock_datetime.now.return_value = self._mock_current_datetime
+        _FakeDatetime.current_datetime = self._mock_current_datetime
 
     def test_disconnect_command_is_sent_during_teardown_when_slave_is_still_connected(self):
         slave = self._create_slave()
@@ -35,7 +80,7 @@ class TestSlave(BaseUnitTestCase):
 
         slave.teardown()
 
-        expected_teardown_url = 'http://splinter.sensei.net:43001/v1/build/3/teardown'
+        expected_teardown_url = self._FAKE_SLAVE_API_URL + '/build/3/teardown'
         self.mock_network.post.assert_called_once_with(expected_teardown_url)
 
     def test_disconnect_command_is_not_sent_during_teardown_when_slave_has_disconnected(self):
@@ -50,7 +95,6 @@ class TestSlave(BaseUnitTestCase):
 
     def test_git_project_params_are_modified_for_slave(self):
         slave = self._create_slave()
-        slave._network.post_with_digest = Mock()
 
         build_request = BuildRequest({
             'type': 'git',
@@ -60,13 +104,13 @@ class TestSlave(BaseUnitTestCase):
             'url': 'ssh://new-url-for-clusterrunner-master',
             'extra': 'something_extra',
         }))
-        mock_build = MagicMock(spec=Build, build_request=build_request,
-                               build_id=Mock(return_value=888), project_type=mock_git)
+        # Slave.setup() only reads these three attributes from the build.
+        fake_build = SimpleNamespace(build_request=build_request, build_id=lambda: 888, project_type=mock_git)
 
-        slave.setup(mock_build, executor_start_index=777)
+        slave.setup(fake_build, executor_start_index=777)
 
-        slave._network.post_with_digest.assert_called_with(
-            'http://{}/v1/build/888/setup'.format(self._FAKE_SLAVE_URL),
+        self.mock_network.post_with_digest.assert_called_with(
+            self._FAKE_SLAVE_API_URL + '/build/888/setup',
             {
                 'build_executor_start_index': 777,
                 'project_type_params': {
@@ -81,16 +125,20 @@ class TestSlave(BaseUnitTestCase):
         # This test enforces an ordering that avoids a race where the slave finishes setup and posts back before the
         # master has actually set the slave's current_build_id.
         slave = self._create_slave()
-        mock_build = Mock()
+        fake_build = SimpleNamespace(
+            build_request=SimpleNamespace(build_parameters=lambda: {}),
+            build_id=lambda: 999,
+            project_type=SimpleNamespace(slave_param_overrides=lambda: {}),
+        )
 
         def assert_slave_build_id_is_already_set(*args, **kwargs):
-            self.assertEqual(slave.current_build_id, mock_build.build_id(),
+            self.assertEqual(slave.current_build_id, 999,
                              'slave.current_build_id should be set before the master tells the slave to do setup.')
 
-        slave._network.post_with_digest = Mock(side_effect=assert_slave_build_id_is_already_set)
-        slave.setup(mock_build, executor_start_index=0)
+        self.mock_network.post_with_digest.side_effect = assert_slave_build_id_is_already_set
+        slave.setup(fake_build, executor_start_index=0)
 
-        self.assertEqual(slave._network.post_with_digest.call_count, 1,
+        self.assertEqual(self.mock_network.post_with_digest.call_count, 1,
                          'The behavior that this test is checking depends on slave setup being triggered via '
                          'slave._network.post_with_digest().')
 
@@ -102,32 +150,26 @@ class TestSlave(BaseUnitTestCase):
         self.assertFalse(is_slave_alive)
         self.assertFalse(self.mock_network.get.called)
 
-    def test_is_alive_returns_false_if_response_not_ok(self):
-        slave = self._create_slave()
-        response_mock = self.mock_network.get.return_value
-        response_mock.ok = False
-        is_slave_alive = slave.is_alive(use_cached=False)
-
-        self.assertFalse(is_slave_alive)
-        self.assertFalse(response_mock.json.called)
-
-    def test_is_alive_returns_false_if_response_is_ok_but_is_alive_is_false(self):
+    @genty_dataset(
+        response_not_ok=(False, None, False),
+        response_ok_but_is_alive_false=(True, {'slave': {'is_alive': False}}, False),
+        response_ok_and_is_alive_true=(True, {'slave': {'is_alive': True}}, True),
+    )
+    def test_is_alive_returns_expected_value_for_slave_api_response(
+            self,
+            response_ok,
+            response_json,
+            expected_is_alive,
+    ):
         slave = self._create_slave()
-        response_mock = self.mock_network.get.return_value
-        response_mock.ok = True
-        response_mock.json.return_value = {'slave': {'is_alive': False}}
-        is_slave_alive = slave.is_alive(use_cached=False)
-
-        self.assertFalse(is_slave_alive)
+        response = _FakeResponse(ok=response_ok, json_data=response_json)
+        self.mock_network.get.return_value = response
 
-    def test_is_alive_returns_true_if_response_is_ok_and_is_alive_is_true(self):
-        slave = self._create_slave()
-        response_mock = self.mock_network.get.return_value
-        response_mock.ok = True
-        response_mock.json.return_value = {'slave': {'is_alive': True}}
         is_slave_alive = slave.is_alive(use_cached=False)
 
-        self.assertTrue(is_slave_alive)
+        self.assertEqual(is_slave_alive, expected_is_alive)
+        self.assertEqual(response.json_was_read, response_ok,
+                         'The response body should only be read if the response is ok.')
 
     def test_is_alive_makes_correct_network_call_to_slave(self):
         slave = self._create_slave(
@@ -152,19 +194,7 @@ class TestSlave(BaseUnitTestCase):
 
         self.assertRaises(SlaveMarkedForShutdownError, slave.mark_as_idle)
         self.mock_network.post_with_digest.assert_called_once_with(
-            AnyStringMatching('/v1/kill'), ANY, ANY)
-
-    def test_start_subjob_raises_if_slave_is_dead(self):
-        slave = self._create_slave()
-        slave._is_alive = False
-
-        self.assertRaises(DeadSlaveError, slave.start_subjob, Mock())
-
-    def test_start_subjob_raises_if_slave_is_shutdown(self):
-        slave = self._create_slave()
-        slave._is_in_shutdown_mode = True
-
-        self.assertRaises(SlaveMarkedForShutdownError, slave.start_subjob, Mock())
+            _KILL_URL_MATCHER, ANY, ANY)
 
     def test_set_shutdown_mode_should_set_is_shutdown_and_not_kill_slave_if_slave_has_a_build(self):
         slave = self._create_slave()
@@ -181,7 +211,19 @@ class TestSlave(BaseUnitTestCase):
         slave.set_shutdown_mode()
 
         self.mock_network.post_with_digest.assert_called_once_with(
-            AnyStringMatching('/v1/kill'), ANY, ANY)
+            _KILL_URL_MATCHER, ANY, ANY)
+
+    def test_start_subjob_raises_if_slave_is_dead(self):
+        slave = self._create_slave()
+        slave._is_alive = False
+
+        self.assertRaises(DeadSlaveError, slave.start_subjob, _SENTINEL_SUBJOB)
+
+    def test_start_subjob_raises_if_slave_is_shutdown(self):
+        slave = self._create_slave()
+        slave._is_in_shutdown_mode = True
+
+        self.assertRaises(SlaveMarkedForShutdownError, slave.start_subjob, _SENTINEL_SUBJOB)
 
     def test_kill_should_post_to_slave_api(self):
         slave = self._create_slave()
@@ -189,7 +231,7 @@ class TestSlave(BaseUnitTestCase):
         slave.kill()
 
         self.mock_network.post_with_digest.assert_called_once_with(
-            AnyStringMatching('/v1/kill'), ANY, ANY)
+            _KILL_URL_MATCHER, ANY, ANY)
 
     def test_mark_dead_should_reset_network_session(self):
         slave = self._create_slave()
@@ -206,12 +248,12 @@ class TestSlave(BaseUnitTestCase):
             slave.start_subjob(self._create_test_subjob())
 
     def test_start_subjob_makes_correct_call_to_slave(self):
-        slave = self._create_slave(slave_url='splinter.sensei.net:43001')
+        slave = self._create_slave()
         subjob = self._create_test_subjob(build_id=911, subjob_id=187)
 
         slave.start_subjob(subjob)
 
-        expected_start_subjob_url = 'http://splinter.sensei.net:43001/v1/build/911/subjob/187'
+        expected_start_subjob_url = self._FAKE_SLAVE_API_URL + '/build/911/subjob/187'
         (url, post_body, _), _ = self.mock_network.post_with_digest.call_args
         self.assertEqual(url, expected_start_subjob_url,
                          'A correct POST call should be sent to slave to start a subjob.')
@@ -227,7 +269,7 @@ class TestSlave(BaseUnitTestCase):
     def test_update_last_heartbeat_time_updates_last_heartbeat_time(self):
             slave = self._create_slave()
             mock_updated_datetime = datetime(2018,4,20)
-            self._mock_datetime.now.return_value = mock_updated_datetime
+            _FakeDatetime.current_datetime = mock_updated_datetime
             slave.update_last_heartbeat_time()
 
             self.assertEqual(slave.get_last_heartbeat_time(), mock_updated_datetime, 'last heartbeat time is updated')
@@ -248,112 +290,82 @@ class TestSlave(BaseUnitTestCase):
         return Subjob(
             build_id=build_id,
             subjob_id=subjob_id,
-            project_type=project_type or Mock(),
-            job_config=job_config or Mock(),
-            atoms=atoms or [Mock()],
+            project_type=project_type or self._default_project_type,
+            job_config=job_config or self._default_job_config,
+            atoms=atoms or [self._default_atom],
         )
 
 
 @genty
 class TestSlaveRegistry(BaseUnitTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.patch_class('app.master.slave.Network')
+
     def setUp(self):
         super().setUp()
+        # Create the slaves after the base setUp() resets the slave id counter so that their ids don't depend on the
+        # order that tests run in.
+        self._slave1 = Slave('raphael.turtles.gov', 1)
+        self._slave2 = Slave('leonardo.turtles.gov', 1)
+        self.slave_registry = SlaveRegistry.singleton()
+        self.slave_registry.add_slave(self._slave1)
+        self.slave_registry.add_slave(self._slave2)
 
     @genty_dataset(
         slave_id_specified=({'slave_id': 400},),
         slave_url_specified=({'slave_url': 'michelangelo.turtles.gov'},),
     )
     def test_get_slave_raises_exception_on_slave_not_found(self, get_slave_kwargs):
-        slave_registry = SlaveRegistry.singleton()
-        slave1 = Slave('raphael.turtles.gov', 1)
-        slave2 = Slave('leonardo.turtles.gov', 1)
-        slave_registry.add_slave(slave1)
-        slave_registry.add_slave(slave2)
-
         with self.assertRaises(ItemNotFoundError):
-            slave_registry.get_slave(**get_slave_kwargs)
+            self.slave_registry.get_slave(**get_slave_kwargs)
 
     @genty_dataset(
         both_arguments_specified=({'slave_id': 1, 'slave_url': 'raphael.turtles.gov'},),
         neither_argument_specified=({},),
     )
     def test_get_slave_raises_exception_on_invalid_arguments(self, get_slave_kwargs):
-        slave_registry = SlaveRegistry.singleton()
-        slave1 = Slave('raphael.turtles.gov', 1)
-        slave_registry.add_slave(slave1)
-
         with self.assertRaises(ValueError):
-            slave_registry.get_slave(**get_slave_kwargs)
+            self.slave_registry.get_slave(**get_slave_kwargs)
 
     def test_get_slave_returns_valid_slave(self):
-        slave_registry = SlaveRegistry.singleton()
-        slave1 = Slave('raphael.turtles.gov', 1)
-        slave2 = Slave('leonardo.turtles.gov', 1)
-        slave_registry.add_slave(slave1)
-        slave_registry.add_slave(slave2)
-
-        self.assertEquals(slave_registry.get_slave(slave_url=slave1.url), slave1,
+        self.assertEquals(self.slave_registry.get_slave(slave_url=self._slave1.url), self._slave1,
                           'Get slave with url should return valid slave.')
-        self.assertEquals(slave_registry.get_slave(slave_id=slave2.id), slave2,
+        self.assertEquals(self.slave_registry.get_slave(slave_id=self._slave2.id), self._slave2,
                           'Get slave with id should return valid slave.')
 
     def test_add_slave_adds_slave_in_both_dicts(self):
-        slave_registry = SlaveRegistry.singleton()
-        slave1 = Slave('raphael.turtles.gov', 1)
-        slave2 = Slave('leonardo.turtles.gov', 1)
-        slave_registry.add_slave(slave1)
-        slave_registry.add_slave(slave2)
-
-        self.assertEqual(2, len(slave_registry.get_all_slaves_by_id()),
-                         'Exactly two slaves should be in the all_slaves_by_id dict.')
-        self.assertEqual(2, len(slave_registry.get_all_slaves_by_url()),
-                         'Exactly two slaves should be in the all_slaves_by_url dict.')
+        self._assert_registry_slave_count(2)
 
     def test_remove_slave_by_slave_instance_removes_slave_from_both_dicts(self):
-        slave_registry = SlaveRegistry.singleton()
-        slave1 = Slave('raphael.turtles.gov', 1)
-        slave2 = Slave('leonardo.turtles.gov', 1)
-        slave_registry.add_slave(slave1)
-        slave_registry.add_slave(slave2)
+        self._assert_registry_slave_count(2)
 
-        self.assertEqual(2, len(slave_registry.get_all_slaves_by_id()),
-                         'Exactly two slaves should be in the all_slaves_by_id dict.')
-        self.assertEqual(2, len(slave_registry.get_all_slaves_by_url()),
-                         'Exactly two slaves should be in the all_slaves_by_url dict.')
+        self.slave_registry.remove_slave(slave=self._slave1)
 
-        slave_registry.remove_slave(slave=slave1)
-
-        self.assertEqual(1, len(slave_registry.get_all_slaves_by_id()),
-                         'Exactly one slave should be in the all_slaves_by_id dict after removing one slave.')
-        self.assertEqual(1, len(slave_registry.get_all_slaves_by_url()),
-                         'Exactly one slave should be in the all_slaves_by_url dict after removing one slave.')
+        self._assert_registry_slave_count(1)
 
     def test_remove_slave_by_slave_url_removes_slave_from_both_dicts(self):
-        slave_registry = SlaveRegistry.singleton()
-        slave1 = Slave('raphael.turtles.gov', 1)
-        slave2 = Slave('leonardo.turtles.gov', 1)
-        slave_registry.add_slave(slave1)
-        slave_registry.add_slave(slave2)
-
-        self.assertEqual(2, len(slave_registry.get_all_slaves_by_id()),
-                         'Exactly two slaves should be in the all_slaves_by_id dict.')
-        self.assertEqual(2, len(slave_registry.get_all_slaves_by_url()),
-                         'Exactly two slaves should be in the all_slaves_by_url dict.')
+        self._assert_registry_slave_count(2)
 
-        slave_registry.remove_slave(slave_url=slave1.url)
+        self.slave_registry.remove_slave(slave_url=self._slave1.url)
 
-        self.assertEqual(1, len(slave_registry.get_all_slaves_by_id()),
-                         'Exactly one slave should be in the all_slaves_by_id dict after removing one slave.')
-        self.assertEqual(1, len(slave_registry.get_all_slaves_by_url()),
-                         'Exactly one slave should be in the all_slaves_by_url dict after removing one slave.')
+        self._assert_registry_slave_count(1)
 
     def test_remove_slave_raises_exception_on_invalid_arguments(self):
-        slave_registry = SlaveRegistry.singleton()
-        slave1 = Slave('raphael.turtles.gov', 1)
-        slave_registry.add_slave(slave1)
+        with self.assertRaises(ValueError):
+            self.slave_registry.remove_slave(slave=self._slave1, slave_url=self._slave1.url)
 
         with self.assertRaises(ValueError):
-            # Both arguments specified
-            slave_registry.remove_slave(slave=slave1, slave_url=slave1.url)
-            # No arguments specified
-            slave_registry.remove_slave(slave=None, slave_url=None)
+            self.slave_registry.remove_slave()
+
+    def _assert_registry_slave_count(self, expected_count):
+        """
+        Assert that the slave registry holds the expected number of slaves in both its by-id and by-url dicts.
+        :type expected_count: int
+        """
+        self.assertEqual(expected_count, len(self.slave_registry.get_all_slaves_by_id()),
+                         'Unexpected number of slaves in the all_slaves_by_id dict.')
+        self.assertEqual(expected_count, len(self.slave_registry.get_all_slaves_by_url()),
+                         'Unexpected number of slaves in the all_slaves_by_url dict.')
@@ -9,6 +9,11 @@ from test.framework.base_unit_test_case import BaseUnitTestCase
 
 class TestSlaveAllocator(BaseUnitTestCase):
 
+    def setUp(self):
+        super().setUp()
+        # A fresh pool per test so that configured return values and side effects cannot leak between tests.
+        self._mock_scheduler_pool = Mock(spec_set=BuildSchedulerPool)
+
     def test_start_should_raise_if_allocation_thread_is_dead(self):
         slave_allocator = self._create_slave_allocator()
         slave_allocator._allocation_thread.is_alive = Mock(return_value=True)
@@ -29,7 +34,7 @@ class TestSlaveAllocator(BaseUnitTestCase):
                           allocate_slave=Mock(side_effect=AbortLoopForTesting))
         mock_slave = Mock(spec=Slave, url='', is_alive=Mock(return_value=True), is_shutdown=Mock(return_value=False))
         slave_allocator = self._create_slave_allocator()
-        slave_allocator._scheduler_pool.next_prepared_build_scheduler = Mock(return_value=mock_build)
+        self._mock_scheduler_pool.next_prepared_build_scheduler.return_value = mock_build
         slave_allocator._idle_slaves.get = Mock(return_value=mock_slave)
 
         self.assertRaises(AbortLoopForTesting, slave_allocator._slave_allocation_loop)
@@ -38,7 +43,7 @@ class TestSlaveAllocator(BaseUnitTestCase):
         mock_build = Mock(spec=Build, needs_more_slaves=Mock(side_effect=[True, False]))
         mock_slave = Mock(spec=Slave, url='', is_alive=Mock(return_value=True), is_shutdown=Mock(return_value=False))
         slave_allocator = self._create_slave_allocator()
-        slave_allocator._scheduler_pool.next_prepared_build_scheduler = Mock(return_value=mock_build)
+        self._mock_scheduler_pool.next_prepared_build_scheduler.return_value = mock_build
         slave_allocator._idle_slaves.get = Mock(return_value=mock_slave)
         slave_allocator.add_idle_slave = Mock(side_effect=AbortLoopForTesting)
 
@@ -71,7 +76,7 @@ class TestSlaveAllocator(BaseUnitTestCase):
         :param kwargs: Any constructor parameters for the slave; if none are specified, test defaults will be used.
         :rtype: SlaveAllocator
         """
-        return SlaveAllocator(Mock(spec_set=BuildSchedulerPool))
+        return SlaveAllocator(self._mock_scheduler_pool)
 
 class AbortLoopForTesting(Exception):
     """
@@ -1,13 +1,16 @@
-from unittest.mock import Mock
+from genty import genty, genty_dataset
+
 from app.master.atom import Atom
 from app.master.time_based_atom_grouper import TimeBasedAtomGrouper, _AtomTimingDataError
 from test.framework.base_unit_test_case import BaseUnitTestCase
 
 
+@genty
 class TestTimeBasedAtomGrouper(BaseUnitTestCase):
     def _mock_atoms(self, command_strings):
-        atom_spec = Atom('key', 'val')
-        return [Mock(spec_set=atom_spec, command_string=cmd) for cmd in command_strings]
+        # Atom is a plain attribute holder, so real instances are much cheaper to create than spec'd mocks (which
+        # matters for the 1000 atom test). The grouper only reads command_string and reads/writes expected_time.
+        return [Atom(cmd) for cmd in command_strings]
 
     def test_coalesce_new_atoms_with_no_atom_times(self):
         new_atoms = self._mock_atoms(['atom_1', 'atom_2', 'atom_3'])
@@ -41,22 +44,45 @@ class TestTimeBasedAtomGrouper(BaseUnitTestCase):
         self.assertEquals(total_time, 11.0)
         self._assert_coalesced_contents(new_atoms, expected_contents)
 
-    def test_groupings_data_set_1(self):
-        new_atoms = self._mock_atoms([
-            'atom_1', 'atom_2', 'atom_3', 'atom_4', 'atom_5', 'atom_6', 'atom_7', 'atom_8', 'atom_9', 'atom_10'])
-        old_atoms_with_times = {
-            'atom_1': 1.0, 'atom_2': 10.0, 'atom_3': 11.0, 'atom_4': 2.0, 'atom_5': 10.0, 'atom_6': 5.0,
-            'atom_7': 2.0, 'atom_8': 8.0, 'atom_9': 10.0, 'atom_10': 3.0
-        }
-        expected_groupings = [
-            ['atom_2', 'atom_3', 'atom_10'],
-            ['atom_4', 'atom_5', 'atom_7', 'atom_9'],
-            ['atom_8'],
-            ['atom_6'],
-            ['atom_1']
-        ]
+    @genty_dataset(
+        data_set_1=(
+            ['atom_1', 'atom_2', 'atom_3', 'atom_4', 'atom_5', 'atom_6', 'atom_7', 'atom_8', 'atom_9', 'atom_10'],
+            {
+                'atom_1': 1.0, 'atom_2': 10.0, 'atom_3': 11.0, 'atom_4': 2.0, 'atom_5': 10.0, 'atom_6': 5.0,
+                'atom_7': 2.0, 'atom_8': 8.0, 'atom_9': 10.0, 'atom_10': 3.0
+            },
+            2,
+            [
+                ['atom_2', 'atom_3', 'atom_10'],
+                ['atom_4', 'atom_5', 'atom_7', 'atom_9'],
+                ['atom_8'],
+                ['atom_6'],
+                ['atom_1']
+            ],
+        ),
+        data_set_2=(
+            ['atom_1', 'atom_2', 'atom_3', 'atom_4', 'atom_5'],
+            {'atom_1': 100.0, 'atom_2': 100.0, 'atom_3': 50.0, 'atom_4': 2.0, 'atom_5': 2.0},
+            3,
+            [['atom_1'], ['atom_2'], ['atom_3', 'atom_4', 'atom_5']],
+        ),
+        data_set_3=(
+            ['atom_1', 'atom_2', 'atom_3', 'atom_4', 'atom_5'],
+            {'atom_1': 100.0, 'atom_2': 100.0, 'atom_3': 50.0, 'atom_4': 2.0, 'atom_5': 2.0},
+            2,
+            [['atom_1'], ['atom_2'], ['atom_3'], ['atom_4', 'atom_5']],
+        ),
+        data_set_4=(
+            ['atom_1', 'atom_2', 'atom_3', 'atom_4', 'atom_5'],
+            {'atom_1': 100.0, 'atom_2': 100.0, 'atom_3': 50.0, 'atom_4': 2.0, 'atom_5': 2.0},
+            5,
+            [['atom_1'], ['atom_2'], ['atom_3'], ['atom_4'], ['atom_5']],
+        ),
+    )
+    def test_groupings(self, atom_command_strings, old_atoms_with_times, max_executors, expected_groupings):
+        new_atoms = self._mock_atoms(atom_command_strings)
 
-        atom_grouper = TimeBasedAtomGrouper(new_atoms, 2, old_atoms_with_times, 'some_project_directory')
+        atom_grouper = TimeBasedAtomGrouper(new_atoms, max_executors, old_atoms_with_times, 'some_project_directory')
         subjobs = atom_grouper.groupings()
 
         self._assert_subjobs_match_expected_groupings(subjobs, expected_groupings)
@@ -82,42 +108,6 @@ class TestTimeBasedAtomGrouper(BaseUnitTestCase):
 
         self.assertEquals(num_atoms, len(subjobs))
 
-    def test_groupings_data_set_2(self):
-        new_atoms = self._mock_atoms(['atom_1', 'atom_2', 'atom_3', 'atom_4', 'atom_5'])
-        old_atoms_with_times = {
-            'atom_1': 100.0, 'atom_2': 100.0, 'atom_3': 50.0, 'atom_4': 2.0, 'atom_5': 2.0
-        }
-        expected_groupings = [['atom_1'], ['atom_2'], ['atom_3', 'atom_4', 'atom_5']]
-
-        atom_grouper = TimeBasedAtomGrouper(new_atoms, 3, old_atoms_with_times, 'some_project_directory')
-        subjobs = atom_grouper.groupings()
-
-        self._assert_subjobs_match_expected_groupings(subjobs, expected_groupings)
-
-    def test_groupings_data_set_3(self):
-        new_atoms = self._mock_atoms(['atom_1', 'atom_2', 'atom_3', 'atom_4', 'atom_5'])
-        old_atoms_with_times = {
-            'atom_1': 100.0, 'atom_2': 100.0, 'atom_3': 50.0, 'atom_4': 2.0, 'atom_5': 2.0
-        }
-        expected_groupings = [['atom_1'], ['atom_2'], ['atom_3'], ['atom_4', 'atom_5']]
-
-        atom_grouper = TimeBasedAtomGrouper(new_atoms, 2, old_atoms_with_times, 'some_project_directory')
-        subjobs = atom_grouper.groupings()
-
-        self._assert_subjobs_match_expected_groupings(subjobs, expected_groupings)
-
-    def test_groupings_data_set_4(self):
-        new_atoms = self._mock_atoms(['atom_1', 'atom_2', 'atom_3', 'atom_4', 'atom_5'])
-        old_atoms_with_times = {
-            'atom_1': 100.0, 'atom_2': 100.0, 'atom_3': 50.0, 'atom_4': 2.0, 'atom_5': 2.0
-        }
-        expected_groupings = [['atom_1'], ['atom_2'], ['atom_3'], ['atom_4'], ['atom_5']]
-
-        atom_grouper = TimeBasedAtomGrouper(new_atoms, 5, old_atoms_with_times, 'some_project_directory')
-        subjobs = atom_grouper.groupings()
-
-        self._assert_subjobs_match_expected_groupings(subjobs, expected_groupings)
-
     def test_groupings_maintains_project_directory_in_returned_atoms(self):
         new_atoms = self._mock_atoms([
             '/var/clusterrunner/repos/scm/atom_1',
@@ -16,12 +16,16 @@ from test.framework.comparators import AnyStringMatching
 @genty
 class TestGit(BaseUnitTestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # These are never configured or asserted on by the tests, so patch them once for the whole class.
+        cls.patch_class('app.project_type.git.fs.create_dir')
+        cls.patch_class('os.unlink')
+        cls.patch_class('os.symlink')
+
     def setUp(self):
         super().setUp()
-        self.patch('app.project_type.git.fs.create_dir')
-        self.patch('os.unlink')
-        self.patch('os.symlink')
-
         self.os_path_exists_mock = self.patch('app.project_type.git.os.path.exists')
         self.os_path_exists_mock.return_value = False
         self.os_path_isfile_mock = self.patch('app.project_type.git.os.path.isfile')
@@ -121,9 +125,7 @@ class TestGit(BaseUnitTestCase):
 
     def test_get_repo_directory_removes_colon_from_directory_if_exists(self):
         Configuration['repo_directory'] = join(expanduser('~'), 'tmp', 'repos')
-        git = Git("some_remote_value", 'origin', 'ref/to/some/branch')
-
-        actual_repo_directory = git.get_full_repo_directory('ssh://source_control.cr.com:1234/master')
+        actual_repo_directory = Git.get_full_repo_directory('ssh://source_control.cr.com:1234/master')
         expected_repo_directory = join(
             Configuration['repo_directory'],
             'source_control.cr.com1234',
@@ -134,9 +136,7 @@ class TestGit(BaseUnitTestCase):
 
     def test_get_timing_file_directory_removes_colon_from_directory_if_exists(self):
         Configuration['timings_directory'] = join(expanduser('~'), 'tmp', 'timings')
-        git = Git("some_remote_value", 'origin', 'ref/to/some/branch')
-
-        actual_timing_directory = git.get_timing_file_directory('ssh://source_control.cr.com:1234/master')
+        actual_timing_directory = Git.get_timing_file_directory('ssh://source_control.cr.com:1234/master')
         expected_timing_directory = join(
             Configuration['timings_directory'],
             'source_control.cr.com1234',
@@ -280,16 +280,18 @@ class TestGit(BaseUnitTestCase):
         :rtype: MagicMock
         """
         command_to_result_map = command_to_result_map or {}
+        compiled_command_patterns = [
+            (re.compile(command_regex), fake_result) for command_regex, fake_result in command_to_result_map.items()]
         self.patch('app.project_type.project_type.TemporaryFile', new=lambda: Mock())
         project_type_popen_patch = self.patch('app.project_type.project_type.Popen_with_delayed_expansion')
 
         def fake_popen_constructor(command, stdout, stderr, *args, **kwargs):
-            fake_result = _FakePopenResult()  # default value
-            for command_regex in command_to_result_map:
-                if re.search(command_regex, command):
-                    fake_result = command_to_result_map[command_regex]
+            fake_result = _DEFAULT_FAKE_POPEN_RESULT
+            for command_pattern, command_result in compiled_command_patterns:
+                if command_pattern.search(command):
+                    fake_result = command_result
                     break
-            stdout.read.return_value = fake_result.stdout.encode()
+            stdout.read.return_value = fake_result.encoded_stdout
             return Mock(spec=Popen, returncode=fake_result.return_code)
 
         project_type_popen_patch.side_effect = fake_popen_constructor
@@ -301,3 +303,9 @@ class _FakePopenResult:
         self.return_code = return_code
         self.stdout = stdout
         self.stderr = stderr
+        self.encoded_stdout = stdout.encode()  # what the fake process's stdout file yields when read
+
+
+# The result for any command that isn't in a test's command_to_result_map. Fake results are never modified, so this
+# can be shared.
+_DEFAULT_FAKE_POPEN_RESULT = _FakePopenResult()
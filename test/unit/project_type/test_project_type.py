@@ -4,8 +4,6 @@ from unittest.mock import ANY, MagicMock
 
 from app.master.job_config import JobConfig
 from app.project_type.project_type import ProjectType
-from app.util.safe_thread import SafeThread
-from app.util.unhandled_exception_handler import UnhandledExceptionHandler
 from test.framework.base_unit_test_case import BaseUnitTestCase
 
 
@@ -96,8 +94,7 @@ class TestProjectType(BaseUnitTestCase):
             args_to_check,
             blacklist,
             expected):
-        project_type = _FakeEnvWithDefaultArgsAndDocs('dirt', 'breeze', 'drop')
-        arg_mapping = project_type.constructor_arguments_info(blacklist)
+        arg_mapping = _FakeEnvWithDefaultArgsAndDocs.constructor_arguments_info(blacklist)
         for arg_name in args_to_check:
             self.assertEqual(arg_name in arg_mapping, expected)
 
@@ -105,23 +102,22 @@ class TestProjectType(BaseUnitTestCase):
         self._mock_console_output(b'fake_output')
         self.mock_popen.pid = 55555
         self._simulate_hanging_popen_process()
-
         project_type = ProjectType()
-        command_thread = SafeThread(target=project_type.execute_command_in_project, args=('echo The power is yours!',))
-
-        # This calls execute_command_in_project() on one thread, and calls kill_subprocesses() on another. The
-        # kill_subprocesses() call should cause the first thread to exit.
-        command_thread.start()
-        project_type.kill_subprocesses()
-
-        # This *should* join immediately, but we specify a timeout just in case something goes wrong so that the test
-        # doesn't hang. A successful join implies success. We also use the UnhandledExceptionHandler so that exceptions
-        # propagate from the child thread to the test thread and fail the test.
-        with UnhandledExceptionHandler.singleton():
-            command_thread.join(timeout=10)
-            if command_thread.is_alive():
-                self.mock_kill()  # Calling killpg() causes the command thread to end.
-                self.fail('project_type.kill_subprocesses should cause the command execution wait loop to exit.')
+
+        # Call kill_subprocesses() from inside the wait loop rather than from a second thread. This exercises the same
+        # kill event check without the test depending on thread scheduling.
+        hanging_wait = self.mock_popen.wait.side_effect
+
+        def wait_and_kill_subprocesses(timeout=None):
+            if self.mock_popen.wait.call_count > 2:
+                # The loop should have exited by now. Let the command finish so the assertion below fails instead of
+                # the test hanging.
+                return 0
+            project_type.kill_subprocesses()
+            return hanging_wait(timeout)
+
+        self.mock_popen.wait.side_effect = wait_and_kill_subprocesses
+        project_type.execute_command_in_project('echo The power is yours!')
 
         self.mock_kill.assert_called_once_with(55555, ANY)  # Note: os.killpg does not accept keyword args.
 
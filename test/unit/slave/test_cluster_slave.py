@@ -26,15 +26,21 @@ class TestClusterSlave(BaseUnitTestCase):
     _FAKE_SLAVE_HOST = 'racecar.pennybags.gov'
     _FAKE_SLAVE_PORT = 15140
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.patch_class('app.util.fs.tar_directories')
+
     def setUp(self):
         super().setUp()
 
         SlaveConfigLoader().configure_defaults(Configuration.singleton())
         SlaveConfigLoader().configure_postload(Configuration.singleton())
 
+        # These are patched per test rather than per class: slaves do setup, subjob and teardown work on background
+        # threads, and a thread left over from one test must not record calls on the next test's mocks.
         self.mock_network = self.patch('app.slave.cluster_slave.Network').return_value
         self._mock_sys = self.patch('app.slave.cluster_slave.sys')
-        self.patch('app.util.fs.tar_directories')
 
     @genty_dataset(
         current_build_id_not_set=(None,),